@@ -88,12 +88,12 @@ joystick_direction_t joystick_get_direction(uint8_t x, uint8_t y)
     }
     
     /* East: high X, Y near center */
-    if (x >= THRESHOLD_EAST_X && y >= CENTER_Y_MIN && y <= CENTER_X_MAX) {
+    if (x >= THRESHOLD_EAST_X && y >= CENTER_Y_MIN && y <= CENTER_Y_MAX) {
         return DIR_EAST;
     }
     
     /* West: low X, Y near center */
-    if (x <= THRESHOLD_WEST_X && y >= CENTER_Y_MIN && y <= CENTER_X_MAX) {
+    if (x <= THRESHOLD_WEST_X && y >= CENTER_Y_MIN && y <= CENTER_Y_MAX) {
         return DIR_WEST;
     }
     
@@ -12,6 +12,10 @@ import os
 # Add the tests directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Add the visualization directory for the visualizer consistency tests
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'visualization'))
+
 
 # Threshold constants matching config.h
 class JoystickConfig:
@@ -39,14 +43,26 @@ class JoystickConfig:
     DIAGONAL_THRESHOLD_LOW = 50
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def config():
-    """Provide joystick configuration for tests."""
+    """Provide joystick configuration for tests (shared, read-only)."""
     return JoystickConfig()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def direction_detector(config):
-    """Provide a direction detection function matching C implementation."""
+    """Provide a direction detection function matching C implementation.
+    
+    JoystickLogic holds no mutable state, so one instance (and one
+    lookup table) is shared by the whole test session.
+    """
     from joystick_logic import JoystickLogic
     return JoystickLogic(config)
+
+
+@pytest.fixture(scope="session")
+def visualizer():
+    """Provide a JoystickVisualizer (skipped when matplotlib is missing)."""
+    pytest.importorskip("matplotlib")
+    from joystick_visualizer import JoystickVisualizer
+    return JoystickVisualizer()
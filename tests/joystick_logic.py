@@ -4,8 +4,21 @@ Joystick Logic Module - Python implementation for testing.
 This module mirrors the C joystick.c logic for PC-side testing.
 """
 
+import operator
 from enum import IntEnum
-from typing import Tuple
+from functools import lru_cache
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+
+try:
+    from joystick_logic_numba import _detect_many
+except ImportError:  # numba not installed
+    _detect_many = None
+
+
+# Percent of full scale per 8-bit ADC step (multiply instead of divide)
+_PCT_PER_ADC = 100.0 / 255.0
 
 
 class Direction(IntEnum):
@@ -21,6 +34,147 @@ class Direction(IntEnum):
     SOUTH_WEST = 8
 
 
+# Direction members bound to module constants for the hot paths
+_C, _N, _S, _E, _W, _NE, _NW, _SE, _SW = (
+    Direction.CENTER, Direction.NORTH, Direction.SOUTH,
+    Direction.EAST, Direction.WEST, Direction.NORTH_EAST,
+    Direction.NORTH_WEST, Direction.SOUTH_EAST, Direction.SOUTH_WEST,
+)
+
+# Direction members indexed by Direction value
+_DIRECTIONS = (_C, _N, _S, _E, _W, _NE, _NW, _SE, _SW)
+
+
+class PositionInfo(NamedTuple):
+    """Comprehensive position information returned by get_position_info."""
+    x: int
+    y: int
+    x_percent: float
+    y_percent: float
+    direction: Direction
+    direction_name: str
+    is_centered: bool
+
+
+def _classify(x: int, y: int, nY: int, sY: int, eX: int, wX: int,
+              cxmn: int, cxmx: int, cymn: int, cymx: int,
+              dhi: int, dlo: int, amax: int) -> Direction:
+    """
+    Reference direction detection used to build the lookup table.
+    
+    Uses threshold-based zone detection matching the C implementation.
+    
+    Args:
+        x: X-axis value (0-255)
+        y: Y-axis value (0-255)
+        nY: THRESHOLD_NORTH_Y
+        sY: THRESHOLD_SOUTH_Y
+        eX: THRESHOLD_EAST_X
+        wX: THRESHOLD_WEST_X
+        cxmn: CENTER_X_MIN
+        cxmx: CENTER_X_MAX
+        cymn: CENTER_Y_MIN
+        cymx: CENTER_Y_MAX
+        dhi: DIAGONAL_THRESHOLD_HIGH
+        dlo: DIAGONAL_THRESHOLD_LOW
+        amax: ADC_MAX
+        
+    Returns:
+        Detected direction
+    """
+    in_center_x = cxmn <= x <= cxmx
+    in_center_y = cymn <= y <= cymx
+    
+    # Check center zone first (is_centered inlined)
+    if in_center_x and in_center_y:
+        return _C
+    
+    # Check diagonal directions (corners)
+    # North-East: high X, high Y
+    if x > dhi and y > dhi:
+        return _NE
+    
+    # North-West: low X, high Y
+    if x < dlo and y > (amax - dlo):
+        return _NW
+    
+    # South-East: high X, low Y
+    if x > dhi and y < dlo:
+        return _SE
+    
+    # South-West: low X, low Y
+    if x < dlo and y < dlo:
+        return _SW
+    
+    # Check cardinal directions
+    # North: high Y, X near center
+    if y >= nY and in_center_x:
+        return _N
+    
+    # South: low Y, X near center
+    if y <= sY and in_center_x:
+        return _S
+    
+    # East: high X, Y near center
+    if x >= eX and in_center_y:
+        return _E
+    
+    # West: low X, Y near center
+    if x <= wX and in_center_y:
+        return _W
+    
+    # Default to center if no direction matched
+    return _C
+
+
+def _zone_cuts(nY: int, sY: int, eX: int, wX: int,
+               cxmn: int, cxmx: int, cymn: int, cymx: int,
+               dhi: int, dlo: int, amax: int) -> Tuple[List[int], List[int]]:
+    """
+    Return the values at which any X or Y threshold check changes.
+    
+    Splitting each axis at these cuts gives zones within which
+    _classify cannot change its result.
+    
+    Returns:
+        Sorted (x_cuts, y_cuts) lists of values in 1-255
+    """
+    x_cuts = {dlo, wX + 1, cxmn, cxmx + 1, dhi + 1, eX}
+    y_cuts = {dlo, sY + 1, cymn, cymx + 1, dhi + 1, nY, amax - dlo + 1}
+    return (sorted(c for c in x_cuts if 0 < c < 256),
+            sorted(c for c in y_cuts if 0 < c < 256))
+
+
+@lru_cache(maxsize=16)
+def _build_table(thresholds: Tuple[int, ...]) -> bytes:
+    """
+    Build the direction lookup table for a set of thresholds.
+    
+    Runs _classify once per (X zone, Y zone) pair to fill a small
+    dispatch table, then expands it over all 256x256 inputs. Results
+    are cached so instances with equal thresholds share one table.
+    
+    Args:
+        thresholds: Threshold values in JoystickLogic._threshold_key order
+        
+    Returns:
+        65536 bytes indexed by (x << 8) | y holding Direction values
+    """
+    x_cuts, y_cuts = _zone_cuts(*thresholds)
+    # Lowest value of each zone is representative of the whole zone
+    x_reps = [0] + x_cuts
+    y_reps = [0] + y_cuts
+    
+    dispatch = np.array([_classify(x, y, *thresholds)
+                         for x in x_reps for y in y_reps], dtype=np.uint8)
+    
+    values = np.arange(256)
+    x_zone = np.searchsorted(x_cuts, values, side='right')
+    y_zone = np.searchsorted(y_cuts, values, side='right')
+    keys = x_zone[:, None] * len(y_reps) + y_zone[None, :]
+    return dispatch[keys].tobytes()
+
+
 class JoystickLogic:
     """
     Joystick direction detection logic.
@@ -29,26 +183,46 @@ class JoystickLogic:
     detecting direction from X/Y ADC values.
     """
     
-    DIRECTION_NAMES = {
-        Direction.CENTER: "C",
-        Direction.NORTH: "N",
-        Direction.SOUTH: "S",
-        Direction.EAST: "E",
-        Direction.WEST: "W",
-        Direction.NORTH_EAST: "NE",
-        Direction.NORTH_WEST: "NW",
-        Direction.SOUTH_EAST: "SE",
-        Direction.SOUTH_WEST: "SW",
-    }
+    __slots__ = ("config", "_nY", "_sY", "_eX", "_wX",
+                 "_cxmn", "_cxmx", "_cymn", "_cymx",
+                 "_dhi", "_dlo", "_amax", "_table")
+    
+    # Direction names indexed by Direction value
+    _NAME_TABLE = ("C", "N", "S", "E", "W", "NE", "NW", "SE", "SW")
     
     def __init__(self, config):
         """
         Initialize with configuration matching config.h.
         
+        Builds (or reuses) a 256x256 direction lookup table so that
+        get_direction is a single index operation.
+        
         Args:
             config: Configuration object with threshold values
         """
         self.config = config
+        
+        # Hoist thresholds out of the config object for cheap access
+        c = config
+        self._nY = c.THRESHOLD_NORTH_Y
+        self._sY = c.THRESHOLD_SOUTH_Y
+        self._eX = c.THRESHOLD_EAST_X
+        self._wX = c.THRESHOLD_WEST_X
+        self._cxmn = c.CENTER_X_MIN
+        self._cxmx = c.CENTER_X_MAX
+        self._cymn = c.CENTER_Y_MIN
+        self._cymx = c.CENTER_Y_MAX
+        self._dhi = c.DIAGONAL_THRESHOLD_HIGH
+        self._dlo = c.DIAGONAL_THRESHOLD_LOW
+        self._amax = c.ADC_MAX
+        
+        self._table = _build_table(self._threshold_key())
+    
+    def _threshold_key(self) -> Tuple[int, ...]:
+        """Return the threshold values that determine the direction table."""
+        return (self._nY, self._sY, self._eX, self._wX,
+                self._cxmn, self._cxmx, self._cymn, self._cymx,
+                self._dhi, self._dlo, self._amax)
     
     def is_centered(self, x: int, y: int) -> bool:
         """
@@ -61,14 +235,75 @@ class JoystickLogic:
         Returns:
             True if in center zone
         """
-        return (self.config.CENTER_X_MIN <= x <= self.config.CENTER_X_MAX and
-                self.config.CENTER_Y_MIN <= y <= self.config.CENTER_Y_MAX)
+        return (self._cxmn <= x <= self._cxmx and
+                self._cymn <= y <= self._cymx)
     
     def get_direction(self, x: int, y: int) -> Direction:
         """
         Determine direction from X/Y values.
         
-        Uses threshold-based zone detection matching the C implementation.
+        Looks up the precomputed direction table built from _classify.
+        
+        Args:
+            x: X-axis value (0-255)
+            y: Y-axis value (0-255)
+            
+        Returns:
+            Detected direction
+            
+        Raises:
+            ValueError: If x or y is outside 0-255
+        """
+        # Plain ints, so NumPy scalars cannot overflow or wrap the shift
+        x = operator.index(x)
+        y = operator.index(y)
+        # Any bit above the low 8 (or a negative sign) would alias the table
+        if (x | y) >> 8:
+            raise ValueError(f"ADC values must be 0-255, got ({x}, {y})")
+        return _DIRECTIONS[self._table[(x << 8) | y]]
+    
+    def get_directions(self, xs, ys) -> np.ndarray:
+        """
+        Determine directions for arrays of X/Y values.
+        
+        Uses the compiled Numba kernel when available, otherwise
+        indexes the lookup table with NumPy.
+        
+        Args:
+            xs: Sequence of X-axis values (0-255)
+            ys: Sequence of Y-axis values (0-255), same length as xs
+            
+        Returns:
+            uint8 array of Direction values
+            
+        Raises:
+            ValueError: If xs and ys differ in shape or hold values
+                outside 0-255
+        """
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        if xs.shape != ys.shape:
+            raise ValueError(f"xs and ys must have the same shape, "
+                             f"got {xs.shape} and {ys.shape}")
+        # Check before the uint8 cast, which would wrap bad values silently
+        for values in (xs, ys):
+            if values.dtype != np.uint8 and ((values < 0) | (values > 255)).any():
+                raise ValueError("ADC values must be 0-255")
+        xs = np.ascontiguousarray(xs, dtype=np.uint8)
+        ys = np.ascontiguousarray(ys, dtype=np.uint8)
+        
+        if _detect_many is not None:
+            out = np.empty(xs.shape, dtype=np.uint8)
+            _detect_many(xs.ravel(), ys.ravel(), out.ravel(),
+                         self._threshold_key())
+            return out
+        
+        table = np.frombuffer(self._table, dtype=np.uint8)
+        return table[(xs.astype(np.intp) << 8) | ys]
+    
+    def _classify(self, x: int, y: int) -> Direction:
+        """
+        Reference direction detection for this instance's thresholds.
         
         Args:
             x: X-axis value (0-255)
@@ -77,54 +312,7 @@ class JoystickLogic:
         Returns:
             Detected direction
         """
-        # Check center zone first
-        if self.is_centered(x, y):
-            return Direction.CENTER
-        
-        # Check diagonal directions (corners)
-        # North-East: high X, high Y
-        if (x > self.config.DIAGONAL_THRESHOLD_HIGH and 
-            y > self.config.DIAGONAL_THRESHOLD_HIGH):
-            return Direction.NORTH_EAST
-        
-        # North-West: low X, high Y
-        if (x < self.config.DIAGONAL_THRESHOLD_LOW and 
-            y > (self.config.ADC_MAX - self.config.DIAGONAL_THRESHOLD_LOW)):
-            return Direction.NORTH_WEST
-        
-        # South-East: high X, low Y
-        if (x > self.config.DIAGONAL_THRESHOLD_HIGH and 
-            y < self.config.DIAGONAL_THRESHOLD_LOW):
-            return Direction.SOUTH_EAST
-        
-        # South-West: low X, low Y
-        if (x < self.config.DIAGONAL_THRESHOLD_LOW and 
-            y < self.config.DIAGONAL_THRESHOLD_LOW):
-            return Direction.SOUTH_WEST
-        
-        # Check cardinal directions
-        # North: high Y, X near center
-        if (y >= self.config.THRESHOLD_NORTH_Y and 
-            self.config.CENTER_X_MIN <= x <= self.config.CENTER_X_MAX):
-            return Direction.NORTH
-        
-        # South: low Y, X near center
-        if (y <= self.config.THRESHOLD_SOUTH_Y and 
-            self.config.CENTER_X_MIN <= x <= self.config.CENTER_X_MAX):
-            return Direction.SOUTH
-        
-        # East: high X, Y near center
-        if (x >= self.config.THRESHOLD_EAST_X and 
-            self.config.CENTER_Y_MIN <= y <= self.config.CENTER_X_MAX):
-            return Direction.EAST
-        
-        # West: low X, Y near center
-        if (x <= self.config.THRESHOLD_WEST_X and 
-            self.config.CENTER_Y_MIN <= y <= self.config.CENTER_X_MAX):
-            return Direction.WEST
-        
-        # Default to center if no direction matched
-        return Direction.CENTER
+        return _classify(x, y, *self._threshold_key())
     
     def direction_to_string(self, direction: Direction) -> str:
         """
@@ -136,9 +324,11 @@ class JoystickLogic:
         Returns:
             Human-readable direction string
         """
-        return self.DIRECTION_NAMES.get(direction, "?")
+        if 0 <= direction <= Direction.SOUTH_WEST:
+            return self._NAME_TABLE[direction]
+        return "?"
     
-    def get_position_info(self, x: int, y: int) -> dict:
+    def get_position_info(self, x: int, y: int) -> PositionInfo:
         """
         Get comprehensive position information.
         
@@ -147,15 +337,17 @@ class JoystickLogic:
             y: Y-axis value (0-255)
             
         Returns:
-            Dictionary with position details
+            PositionInfo with position details
         """
         direction = self.get_direction(x, y)
-        return {
-            "x": x,
-            "y": y,
-            "x_percent": round(x / 255 * 100, 1),
-            "y_percent": round(y / 255 * 100, 1),
-            "direction": direction,
-            "direction_name": self.direction_to_string(direction),
-            "is_centered": self.is_centered(x, y),
-        }
+        # Only a CENTER result can lie in the dead zone
+        centered = direction == Direction.CENTER and self.is_centered(x, y)
+        return PositionInfo(
+            x=x,
+            y=y,
+            x_percent=round(x * _PCT_PER_ADC, 1),
+            y_percent=round(y * _PCT_PER_ADC, 1),
+            direction=direction,
+            direction_name=self._NAME_TABLE[direction],
+            is_centered=centered,
+        )
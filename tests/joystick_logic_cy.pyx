@@ -0,0 +1,133 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Joystick Logic Cython Extension - compiled direction detection.
+
+Optional C-speed counterpart of joystick_logic for host-side replay
+tools. Thresholds are compiled in from config.h and the direction
+table is built once at import. Build with ``make cython``.
+"""
+
+from joystick_logic import Direction
+
+
+# Thresholds matching config.h
+cdef enum:
+    ADC_MAX = 255
+    THRESHOLD_NORTH_Y = 240
+    THRESHOLD_SOUTH_Y = 50
+    THRESHOLD_EAST_X = 240
+    THRESHOLD_WEST_X = 70
+    CENTER_X_MIN = 70
+    CENTER_X_MAX = 180
+    CENTER_Y_MIN = 110
+    CENTER_Y_MAX = 160
+    DIAGONAL_THRESHOLD_HIGH = 230
+    DIAGONAL_THRESHOLD_LOW = 50
+
+
+# Direction names indexed by Direction value
+_NAME_TABLE = ("C", "N", "S", "E", "W", "NE", "NW", "SE", "SW")
+
+# Direction values indexed by (x << 8) | y
+cdef unsigned char _table[65536]
+
+
+cdef unsigned char _classify(unsigned int x, unsigned int y) noexcept nogil:
+    """Reference direction detection matching joystick.c."""
+    if CENTER_X_MIN <= x <= CENTER_X_MAX and CENTER_Y_MIN <= y <= CENTER_Y_MAX:
+        return 0  # CENTER
+    
+    if x > DIAGONAL_THRESHOLD_HIGH and y > DIAGONAL_THRESHOLD_HIGH:
+        return 5  # NORTH_EAST
+    if x < DIAGONAL_THRESHOLD_LOW and y > ADC_MAX - DIAGONAL_THRESHOLD_LOW:
+        return 6  # NORTH_WEST
+    if x > DIAGONAL_THRESHOLD_HIGH and y < DIAGONAL_THRESHOLD_LOW:
+        return 7  # SOUTH_EAST
+    if x < DIAGONAL_THRESHOLD_LOW and y < DIAGONAL_THRESHOLD_LOW:
+        return 8  # SOUTH_WEST
+    
+    if y >= THRESHOLD_NORTH_Y and CENTER_X_MIN <= x <= CENTER_X_MAX:
+        return 1  # NORTH
+    if y <= THRESHOLD_SOUTH_Y and CENTER_X_MIN <= x <= CENTER_X_MAX:
+        return 2  # SOUTH
+    if x >= THRESHOLD_EAST_X and CENTER_Y_MIN <= y <= CENTER_Y_MAX:
+        return 3  # EAST
+    if x <= THRESHOLD_WEST_X and CENTER_Y_MIN <= y <= CENTER_Y_MAX:
+        return 4  # WEST
+    
+    return 0  # CENTER
+
+
+cdef void _build_table() noexcept nogil:
+    """Fill the direction table from the reference detection."""
+    cdef unsigned int x, y
+    for x in range(256):
+        for y in range(256):
+            _table[(x << 8) | y] = _classify(x, y)
+
+
+_build_table()
+
+
+cpdef unsigned char get_direction(unsigned char x, unsigned char y) noexcept nogil:
+    """
+    Determine direction value from X/Y values.
+    
+    Args:
+        x: X-axis value (0-255)
+        y: Y-axis value (0-255)
+        
+    Returns:
+        Direction value (0-8)
+    """
+    return _table[(<unsigned int>x << 8) | y]
+
+
+cdef class JoystickLogic:
+    """
+    Compiled joystick direction detection logic.
+    
+    Mirrors the joystick_logic.JoystickLogic API for the config.h
+    thresholds compiled into this module.
+    """
+    
+    def is_centered(self, unsigned char x, unsigned char y):
+        """
+        Check if position is in center (dead) zone.
+        
+        Args:
+            x: X-axis value (0-255)
+            y: Y-axis value (0-255)
+            
+        Returns:
+            True if in center zone
+        """
+        return (CENTER_X_MIN <= x <= CENTER_X_MAX and
+                CENTER_Y_MIN <= y <= CENTER_Y_MAX)
+    
+    def get_direction(self, unsigned char x, unsigned char y):
+        """
+        Determine direction from X/Y values.
+        
+        Args:
+            x: X-axis value (0-255)
+            y: Y-axis value (0-255)
+            
+        Returns:
+            Detected direction
+        """
+        return Direction(_table[(<unsigned int>x << 8) | y])
+    
+    def direction_to_string(self, direction):
+        """
+        Convert direction enum to string.
+        
+        Args:
+            direction: Direction enumeration value
+            
+        Returns:
+            Human-readable direction string
+        """
+        if 0 <= direction <= 8:
+            return _NAME_TABLE[direction]
+        return "?"
@@ -0,0 +1,67 @@
+"""
+Joystick Logic Numba Kernels - compiled batch direction detection.
+
+This module provides the optional Numba-accelerated backend for
+JoystickLogic.get_directions. It requires numba; joystick_logic falls
+back to its lookup table when the import fails.
+"""
+
+from numba import njit, prange
+
+
+@njit(cache=True, boundscheck=False)
+def _detect(x, y, params):
+    """
+    Determine the direction value for a single X/Y sample.
+    
+    Args:
+        x: X-axis value (0-255)
+        y: Y-axis value (0-255)
+        params: Thresholds in JoystickLogic._threshold_key order
+        
+    Returns:
+        Direction value (0-8)
+    """
+    nY, sY, eX, wX, cxmn, cxmx, cymn, cymx, dhi, dlo, amax = params
+    
+    in_center_x = cxmn <= x <= cxmx
+    in_center_y = cymn <= y <= cymx
+    
+    # Same check order as joystick.c: center, diagonals, cardinals
+    if in_center_x and in_center_y:
+        return 0  # CENTER
+    
+    if x > dhi and y > dhi:
+        return 5  # NORTH_EAST
+    if x < dlo and y > (amax - dlo):
+        return 6  # NORTH_WEST
+    if x > dhi and y < dlo:
+        return 7  # SOUTH_EAST
+    if x < dlo and y < dlo:
+        return 8  # SOUTH_WEST
+    
+    if y >= nY and in_center_x:
+        return 1  # NORTH
+    if y <= sY and in_center_x:
+        return 2  # SOUTH
+    if x >= eX and in_center_y:
+        return 3  # EAST
+    if x <= wX and in_center_y:
+        return 4  # WEST
+    
+    return 0  # CENTER
+
+
+@njit(parallel=True, cache=True, boundscheck=False)
+def _detect_many(xs, ys, out, params):
+    """
+    Determine direction values for arrays of X/Y samples.
+    
+    Args:
+        xs: 1-D uint8 array of X-axis values
+        ys: 1-D uint8 array of Y-axis values
+        out: 1-D uint8 output array, same length as xs
+        params: Thresholds in JoystickLogic._threshold_key order
+    """
+    for i in prange(xs.shape[0]):
+        out[i] = _detect(xs[i], ys[i], params)
@@ -4,8 +4,9 @@ ADC Simulation Tests.
 Tests for ADC value handling, conversion, and calibration logic.
 """
 
+import numpy as np
 import pytest
-from joystick_logic import JoystickLogic, Direction
+from joystick_logic import JoystickLogic, Direction, _PCT_PER_ADC
 
 
 class TestADCValueConversion:
@@ -13,23 +14,23 @@ class TestADCValueConversion:
     
     def test_adc_to_percent_min(self, config):
         """Test minimum ADC value (0) converts to 0%."""
-        percent = 0 / 255 * 100
+        percent = 0 * _PCT_PER_ADC
         assert percent == 0
     
     def test_adc_to_percent_max(self, config):
         """Test maximum ADC value (255) converts to 100%."""
-        percent = 255 / 255 * 100
+        percent = 255 * _PCT_PER_ADC
         assert percent == 100
     
     def test_adc_to_percent_center(self, config):
         """Test center ADC value (128) converts to ~50%."""
-        percent = 128 / 255 * 100
+        percent = 128 * _PCT_PER_ADC
         assert 50 <= percent <= 51  # Allow small rounding
     
     def test_adc_to_percent_quarter(self, config):
         """Test quarter ADC values."""
-        assert 64 / 255 * 100 == pytest.approx(25.1, rel=0.1)
-        assert 192 / 255 * 100 == pytest.approx(75.3, rel=0.1)
+        assert 64 * _PCT_PER_ADC == pytest.approx(25.1, rel=0.1)
+        assert 192 * _PCT_PER_ADC == pytest.approx(75.3, rel=0.1)
 
 
 class TestCalibrationOffset:
@@ -87,8 +88,9 @@ class TestNoiseFiltering:
         # Reading with spike
         readings_with_spike = [128, 127, 255, 129, 128]  # 255 is spike
         
-        sorted_readings = sorted(readings_with_spike)
-        median = sorted_readings[len(sorted_readings) // 2]
+        # np.partition selects the middle value in O(n) without a full sort
+        k = len(readings_with_spike) // 2
+        median = np.partition(readings_with_spike, k)[k]
         
         assert median == 128  # Spike rejected
     
@@ -97,14 +99,14 @@ class TestNoiseFiltering:
         readings = [100, 130, 125, 135, 128, 120, 132, 127]
         window_size = 3
         
-        moving_averages = []
-        for i in range(len(readings) - window_size + 1):
-            window = readings[i:i + window_size]
-            avg = sum(window) / window_size
-            moving_averages.append(avg)
+        # Window sums from a running (prefix) sum: O(N) instead of O(N*W)
+        cs = np.cumsum(np.asarray(readings, dtype=np.int32))
+        window_sums = cs[window_size - 1:] - np.r_[0, cs[:-window_size]]
+        moving_averages = window_sums / window_size
         
+        assert len(moving_averages) == len(readings) - window_size + 1
         # All averages should be relatively stable
-        assert all(100 <= avg <= 140 for avg in moving_averages)
+        assert np.all((moving_averages >= 100) & (moving_averages <= 140))
 
 
 class TestADCRangeMapping:
@@ -112,8 +114,10 @@ class TestADCRangeMapping:
     
     def test_map_to_angle(self):
         """Test mapping ADC value to angle (0-255 -> 0-180 degrees)."""
+        deg_per_adc = 180.0 / 255.0
+        
         def adc_to_angle(adc_value):
-            return adc_value * 180 / 255
+            return adc_value * deg_per_adc
         
         assert adc_to_angle(0) == 0
         assert adc_to_angle(255) == pytest.approx(180)
@@ -122,7 +126,7 @@ class TestADCRangeMapping:
     def test_map_to_pwm_duty(self):
         """Test mapping ADC value to PWM duty cycle (0-255 -> 0-100%)."""
         def adc_to_duty(adc_value):
-            return adc_value * 100 / 255
+            return adc_value * _PCT_PER_ADC
         
         assert adc_to_duty(0) == 0
         assert adc_to_duty(255) == pytest.approx(100)
@@ -153,9 +157,9 @@ class TestMultiAxisReading:
         
         position_info = direction_detector.get_position_info(x_value, y_value)
         
-        assert position_info["x"] == 128
-        assert position_info["y"] == 250
-        assert position_info["direction"] == Direction.NORTH
+        assert position_info.x == 128
+        assert position_info.y == 250
+        assert position_info.direction == Direction.NORTH
     
     def test_channel_switching_delay(self):
         """Test that channel switching doesn't affect readings."""
@@ -214,19 +218,11 @@ class TestEdgeCasesAndErrors:
     
     def test_rapid_direction_changes(self, direction_detector):
         """Test stability during rapid direction changes."""
-        # Simulate rapid joystick movement
-        positions = [
-            (128, 250),  # N
-            (200, 200),  # transition
-            (250, 135),  # E
-            (180, 50),   # transition
-            (100, 30),   # S
-        ]
-        
-        directions = [
-            direction_detector.get_direction(x, y) 
-            for x, y in positions
-        ]
+        # Simulate rapid joystick movement: N, transition, E, transition, S
+        xs = np.array([128, 200, 250, 180, 100], dtype=np.uint8)
+        ys = np.array([250, 200, 135, 50, 30], dtype=np.uint8)
+        
+        directions = direction_detector.get_directions(xs, ys)
         
         # Should have detected at least N, E, S
         assert Direction.NORTH in directions
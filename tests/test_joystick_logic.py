@@ -5,7 +5,9 @@ These tests verify the direction detection algorithm matches
 the expected behavior defined in the C implementation.
 """
 
+import numpy as np
 import pytest
+import joystick_logic
 from joystick_logic import JoystickLogic, Direction
 
 
@@ -114,6 +116,13 @@ class TestBoundaryConditions:
         result = direction_detector.get_direction(100, 50)
         assert result == Direction.SOUTH
     
+    def test_east_west_use_center_y_band(self, direction_detector):
+        """Test East/West require Y inside the center band (110-160)."""
+        assert direction_detector.get_direction(250, 160) == Direction.EAST
+        assert direction_detector.get_direction(250, 170) != Direction.EAST
+        assert direction_detector.get_direction(60, 160) == Direction.WEST
+        assert direction_detector.get_direction(60, 170) != Direction.WEST
+    
     def test_minimum_values(self, direction_detector):
         """Test minimum ADC values (0, 0)."""
         result = direction_detector.get_direction(0, 0)
@@ -145,6 +154,11 @@ class TestDirectionToString:
         assert direction_detector.direction_to_string(Direction.NORTH_WEST) == "NW"
         assert direction_detector.direction_to_string(Direction.SOUTH_EAST) == "SE"
         assert direction_detector.direction_to_string(Direction.SOUTH_WEST) == "SW"
+    
+    def test_invalid_direction_string(self, direction_detector):
+        """Test out-of-range direction values map to '?'."""
+        assert direction_detector.direction_to_string(9) == "?"
+        assert direction_detector.direction_to_string(-1) == "?"
 
 
 class TestPositionInfo:
@@ -154,69 +168,60 @@ class TestPositionInfo:
         """Test position info for center position."""
         info = direction_detector.get_position_info(128, 135)
         
-        assert info["x"] == 128
-        assert info["y"] == 135
-        assert info["direction"] == Direction.CENTER
-        assert info["direction_name"] == "C"
-        assert info["is_centered"] is True
-        assert 0 <= info["x_percent"] <= 100
-        assert 0 <= info["y_percent"] <= 100
+        assert info.x == 128
+        assert info.y == 135
+        assert info.direction == Direction.CENTER
+        assert info.direction_name == "C"
+        assert info.is_centered is True
+        assert 0 <= info.x_percent <= 100
+        assert 0 <= info.y_percent <= 100
     
     def test_position_info_north(self, direction_detector):
         """Test position info for North position."""
         info = direction_detector.get_position_info(128, 250)
         
-        assert info["direction"] == Direction.NORTH
-        assert info["direction_name"] == "N"
-        assert info["is_centered"] is False
+        assert info.direction == Direction.NORTH
+        assert info.direction_name == "N"
+        assert info.is_centered is False
 
 
 class TestADCSimulation:
     """Tests simulating various ADC reading scenarios."""
     
-    def test_adc_sweep_x_axis(self, direction_detector):
+    @pytest.mark.parametrize("x, expected", [
+        (30, Direction.WEST),     # Low X
+        (128, Direction.CENTER),  # Center X
+        (250, Direction.EAST),    # High X
+    ])
+    def test_adc_sweep_x_axis(self, direction_detector, x, expected):
         """Test direction changes as X sweeps from 0 to 255 with Y centered."""
         y_centered = 135  # In center Y zone
-        
-        # Low X should be West
-        assert direction_detector.get_direction(30, y_centered) == Direction.WEST
-        
-        # Center X should be Center
-        assert direction_detector.get_direction(128, y_centered) == Direction.CENTER
-        
-        # High X should be East
-        assert direction_detector.get_direction(250, y_centered) == Direction.EAST
+        assert direction_detector.get_direction(x, y_centered) == expected
     
-    def test_adc_sweep_y_axis(self, direction_detector):
+    @pytest.mark.parametrize("y, expected", [
+        (30, Direction.SOUTH),    # Low Y
+        (135, Direction.CENTER),  # Center Y
+        (250, Direction.NORTH),   # High Y
+    ])
+    def test_adc_sweep_y_axis(self, direction_detector, y, expected):
         """Test direction changes as Y sweeps from 0 to 255 with X centered."""
         x_centered = 128  # In center X zone
-        
-        # Low Y should be South
-        assert direction_detector.get_direction(x_centered, 30) == Direction.SOUTH
-        
-        # Center Y should be Center
-        assert direction_detector.get_direction(x_centered, 135) == Direction.CENTER
-        
-        # High Y should be North
-        assert direction_detector.get_direction(x_centered, 250) == Direction.NORTH
+        assert direction_detector.get_direction(x_centered, y) == expected
     
-    def test_full_rotation(self, direction_detector):
+    # Starting from North, going clockwise
+    @pytest.mark.parametrize("x, y, expected", [
+        (128, 250, Direction.NORTH),
+        (250, 250, Direction.NORTH_EAST),
+        (250, 135, Direction.EAST),
+        (250, 30, Direction.SOUTH_EAST),
+        (100, 30, Direction.SOUTH),
+        (20, 20, Direction.SOUTH_WEST),
+        (50, 140, Direction.WEST),
+        (30, 240, Direction.NORTH_WEST),
+    ])
+    def test_full_rotation(self, direction_detector, x, y, expected):
         """Test all 8 directions in a clockwise rotation."""
-        # Starting from North, going clockwise
-        expected_sequence = [
-            ((128, 250), Direction.NORTH),      # N
-            ((250, 250), Direction.NORTH_EAST), # NE
-            ((250, 135), Direction.EAST),       # E
-            ((250, 30), Direction.SOUTH_EAST),  # SE
-            ((100, 30), Direction.SOUTH),       # S
-            ((20, 20), Direction.SOUTH_WEST),   # SW
-            ((50, 140), Direction.WEST),        # W
-            ((30, 240), Direction.NORTH_WEST),  # NW
-        ]
-        
-        for (x, y), expected_dir in expected_sequence:
-            result = direction_detector.get_direction(x, y)
-            assert result == expected_dir, f"Expected {expected_dir} at ({x}, {y}), got {result}"
+        assert direction_detector.get_direction(x, y) == expected
 
 
 class TestNoiseAndJitter:
@@ -239,11 +244,193 @@ class TestNoiseAndJitter:
         assert direction_detector.get_direction(128, 240) == Direction.NORTH
         
         # Several readings near threshold (simulating jitter)
-        readings_near_threshold = [239, 240, 241, 240, 238, 242]
-        north_count = sum(
-            1 for y in readings_near_threshold 
-            if direction_detector.get_direction(128, y) == Direction.NORTH
-        )
+        readings_near_threshold = np.array([239, 240, 241, 240, 238, 242],
+                                           dtype=np.uint8)
+        x_centered = np.full_like(readings_near_threshold, 128)
+        directions = direction_detector.get_directions(x_centered,
+                                                       readings_near_threshold)
+        north_count = int(np.count_nonzero(directions == Direction.NORTH))
         
         # At least half should register as North
         assert north_count >= len(readings_near_threshold) // 2
+
+
+class TestLookupTable:
+    """Tests for the precomputed direction lookup table."""
+    
+    def test_table_matches_reference(self, direction_detector):
+        """Test every (x, y) lookup matches the reference classification."""
+        for x in range(256):
+            for y in range(256):
+                assert direction_detector.get_direction(x, y) == \
+                    direction_detector._classify(x, y), f"Mismatch at ({x}, {y})"
+    
+    def test_overlapping_zones_follow_c_order(self, config):
+        """Test diagonals win over cardinals when their zones overlap."""
+        class OverlapConfig(type(config)):
+            DIAGONAL_THRESHOLD_HIGH = 170
+        
+        cfg = OverlapConfig()
+        detector = JoystickLogic(cfg)
+        
+        def c_order(x, y):
+            # Straight transcription of joystick_get_direction()
+            in_x = cfg.CENTER_X_MIN <= x <= cfg.CENTER_X_MAX
+            in_y = cfg.CENTER_Y_MIN <= y <= cfg.CENTER_Y_MAX
+            high = cfg.DIAGONAL_THRESHOLD_HIGH
+            low = cfg.DIAGONAL_THRESHOLD_LOW
+            if in_x and in_y:
+                return Direction.CENTER
+            if x > high and y > high:
+                return Direction.NORTH_EAST
+            if x < low and y > cfg.ADC_MAX - low:
+                return Direction.NORTH_WEST
+            if x > high and y < low:
+                return Direction.SOUTH_EAST
+            if x < low and y < low:
+                return Direction.SOUTH_WEST
+            if y >= cfg.THRESHOLD_NORTH_Y and in_x:
+                return Direction.NORTH
+            if y <= cfg.THRESHOLD_SOUTH_Y and in_x:
+                return Direction.SOUTH
+            if x >= cfg.THRESHOLD_EAST_X and in_y:
+                return Direction.EAST
+            if x <= cfg.THRESHOLD_WEST_X and in_y:
+                return Direction.WEST
+            return Direction.CENTER
+        
+        assert detector.get_direction(175, 245) == Direction.NORTH_EAST
+        for x in range(256):
+            for y in range(256):
+                assert detector.get_direction(x, y) == c_order(x, y), \
+                    f"Mismatch at ({x}, {y})"
+    
+    @pytest.mark.parametrize("x, y", [(0, 256), (256, 0), (-1, 128), (128, -1)])
+    def test_out_of_range_rejected(self, direction_detector, x, y):
+        """Test values outside 0-255 raise instead of aliasing the table."""
+        with pytest.raises(ValueError):
+            direction_detector.get_direction(x, y)
+    
+    @pytest.mark.parametrize("dtype", [np.uint8, np.int16])
+    def test_numpy_scalars_match_ints(self, direction_detector, dtype):
+        """Test NumPy integer scalars classify the same as plain ints."""
+        for x in range(256):
+            for y in (0, 135, 250):
+                assert (direction_detector.get_direction(dtype(x), dtype(y)) ==
+                        direction_detector.get_direction(x, y)), \
+                    f"Mismatch at ({x}, {y})"
+    
+    def test_table_shared_between_instances(self, config):
+        """Test instances with equal thresholds reuse the same table."""
+        first = JoystickLogic(config)
+        second = JoystickLogic(config)
+        assert first._table is second._table
+
+
+class TestBatchDirections:
+    """Tests for get_directions batch detection on both backends."""
+    
+    @pytest.fixture(autouse=True, params=["numba", "numpy"])
+    def backend(self, request, monkeypatch):
+        """Run each test on the Numba kernel and on the lookup table."""
+        if request.param == "numba":
+            if joystick_logic._detect_many is None:
+                pytest.skip("numba not installed")
+        else:
+            monkeypatch.setattr(joystick_logic, "_detect_many", None)
+        return request.param
+    
+    def test_batch_matches_single(self, direction_detector):
+        """Test batch results match get_direction for every (x, y)."""
+        xs = [x for x in range(256) for _ in range(256)]
+        ys = list(range(256)) * 256
+        
+        result = direction_detector.get_directions(xs, ys)
+        expected = [direction_detector.get_direction(x, y) for x, y in zip(xs, ys)]
+        
+        assert result.dtype == np.uint8
+        assert result.tolist() == expected
+    
+    def test_uint8_array_matches_single(self, direction_detector):
+        """Test a uint8 ADC array gives the same result as plain ints."""
+        xs = np.arange(256, dtype=np.uint8)
+        ys = np.full(256, 135, dtype=np.uint8)
+        
+        result = direction_detector.get_directions(xs, ys)
+        expected = [direction_detector.get_direction(x, 135) for x in range(256)]
+        
+        assert result.tolist() == expected
+    
+    def test_shape_mismatch_rejected(self, direction_detector):
+        """Test xs and ys of different shapes raise ValueError."""
+        with pytest.raises(ValueError):
+            direction_detector.get_directions([1, 2, 3], [1])
+    
+    @pytest.mark.parametrize("xs, ys", [([300], [128]), ([-1], [128]),
+                                        ([128], [256]), ([128], [-1])])
+    def test_out_of_range_rejected(self, direction_detector, xs, ys):
+        """Test values outside 0-255 raise instead of wrapping to uint8."""
+        with pytest.raises(ValueError):
+            direction_detector.get_directions(np.array(xs), np.array(ys))
+
+
+class TestCythonExtension:
+    """Tests for the optional compiled detector (built with `make cython`)."""
+    
+    def test_matches_python_logic(self, direction_detector):
+        """Test every (x, y) matches the Python implementation."""
+        cy = pytest.importorskip("joystick_logic_cy")
+        detector = cy.JoystickLogic()
+        
+        for x in range(256):
+            for y in range(256):
+                expected = direction_detector.get_direction(x, y)
+                assert cy.get_direction(x, y) == expected
+                assert detector.get_direction(x, y) == expected
+
+
+class TestVisualizerDirections:
+    """Tests keeping the visualizer lookup table in sync with the C logic."""
+    
+    def test_table_matches_reference(self, visualizer):
+        """Test every (x, y) lookup matches the visualizer's branch code."""
+        for x in range(256):
+            for y in range(256):
+                assert visualizer.get_direction(x, y) == \
+                    visualizer._classify(x, y), f"Mismatch at ({x}, {y})"
+    
+    def test_matches_joystick_logic(self, visualizer, direction_detector):
+        """Test every (x, y) matches the joystick.c mirror."""
+        for x in range(256):
+            for y in range(256):
+                assert visualizer.get_direction(x, y) == \
+                    direction_detector.get_direction(x, y).name, f"Mismatch at ({x}, {y})"
+    
+    @pytest.mark.parametrize("x, y", [(0, 256), (256, 0), (-1, 135), (135, -1)])
+    def test_out_of_range_rejected(self, visualizer, x, y):
+        """Test values outside 0-255 raise like JoystickLogic.get_direction."""
+        with pytest.raises(ValueError):
+            visualizer.get_direction(x, y)
+    
+    @pytest.mark.parametrize("backend", ["numba", "numpy"])
+    def test_vec_matches_reference(self, visualizer, monkeypatch, backend):
+        """Test get_directions_vec matches _classify on both backends."""
+        import joystick_visualizer
+        if backend == "numba":
+            if joystick_visualizer._direction_id_vec is None:
+                pytest.skip("numba not installed")
+        else:
+            monkeypatch.setattr(joystick_visualizer, "_direction_id_vec", None)
+        
+        xs = np.repeat(np.arange(256, dtype=np.uint8), 256)
+        ys = np.tile(np.arange(256, dtype=np.uint8), 256)
+        result = visualizer.get_directions_vec(xs, ys)
+        expected = [visualizer.DIRECTIONS.index(visualizer._classify(x, y))
+                    for x, y in zip(xs.tolist(), ys.tolist())]
+        
+        assert result.tolist() == expected
+        
+        with pytest.raises(ValueError):
+            visualizer.get_directions_vec([1, 2, 3], [1])
+        with pytest.raises(ValueError):
+            visualizer.get_directions_vec([300, -1], [135, 135])
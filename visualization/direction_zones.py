@@ -5,10 +5,37 @@ Generates static visualizations of joystick direction detection zones
 matching the thresholds defined in config.h.
 """
 
+import hashlib
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import numpy as np
 from pathlib import Path
+from PIL import Image, UnidentifiedImageError
+
+import joystick_visualizer
+from joystick_visualizer import draw_zone_map, zone_table
+
+
+def _new_figure(figsize, show: bool) -> Figure:
+    """
+    Create a figure, going through pyplot only when it will be shown.
+    
+    Args:
+        figsize: Figure size in inches
+        show: Whether the figure will be displayed
+        
+    Returns:
+        Figure attached to an Agg canvas (or a pyplot window)
+    """
+    if show:
+        return plt.figure(figsize=figsize)
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
 
 
 class DirectionZonesVisualizer:
@@ -37,20 +64,6 @@ class DirectionZonesVisualizer:
     DIAGONAL_THRESHOLD_HIGH = 230
     DIAGONAL_THRESHOLD_LOW = 50
     
-    # Colors for each direction
-    COLORS = {
-        'center': '#4CAF50',      # Green
-        'north': '#2196F3',       # Blue
-        'south': '#FF9800',       # Orange
-        'east': '#9C27B0',        # Purple
-        'west': '#F44336',        # Red
-        'north_east': '#00BCD4',  # Cyan
-        'north_west': '#3F51B5',  # Indigo
-        'south_east': '#FFEB3B',  # Yellow
-        'south_west': '#795548',  # Brown
-        'undefined': '#E0E0E0',   # Grey
-    }
-    
     def __init__(self, output_dir: str = None):
         """
         Initialize the visualizer.
@@ -64,6 +77,48 @@ class DirectionZonesVisualizer:
         else:
             self.output_dir = Path(__file__).parent.parent / 'docs' / 'images'
             self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        self._signature = None
+    
+    def signature(self) -> str:
+        """
+        Get a hash of everything the saved diagrams depend on.
+        
+        Covers the thresholds, the zone table and the source of both
+        visualization modules. Saved PNGs carry it as metadata.
+        
+        Returns:
+            Hex SHA-256 digest
+        """
+        if self._signature is None:
+            thresholds = [(name, getattr(self, name))
+                          for name in sorted(dir(self)) if name.isupper()]
+            digest = hashlib.sha256(
+                repr((thresholds, zone_table(self).tolist())).encode())
+            for source in (__file__, joystick_visualizer.__file__):
+                digest.update(Path(source).read_bytes())
+            self._signature = digest.hexdigest()
+        return self._signature
+    
+    def is_current(self, filename: str) -> bool:
+        """
+        Check whether a saved diagram was made from the current sources.
+        
+        Args:
+            filename: Image file name in the output directory
+            
+        Returns:
+            True if the file is a readable PNG whose signature matches
+        """
+        path = self.output_dir / filename
+        if not path.exists():
+            return False
+        try:
+            with Image.open(path) as image:
+                return image.text.get('Signature') == self.signature()
+        except (OSError, UnidentifiedImageError):
+            # Truncated or not an image: regenerate it
+            return False
     
     def create_zone_diagram(self, save: bool = True, show: bool = False) -> str:
         """
@@ -76,7 +131,8 @@ class DirectionZonesVisualizer:
         Returns:
             Path to saved image (if saved)
         """
-        fig, ax = plt.subplots(figsize=(10, 10))
+        fig = _new_figure((10, 8.2), show)
+        ax = fig.add_subplot(1, 1, 1)
         
         # Set up the axes
         ax.set_xlim(0, 255)
@@ -86,68 +142,13 @@ class DirectionZonesVisualizer:
         ax.set_ylabel('Y Axis (ADC Value)', fontsize=12)
         ax.set_title('Joystick Direction Detection Zones', fontsize=14, fontweight='bold')
         
-        # Draw background (undefined zones)
-        ax.add_patch(patches.Rectangle(
-            (0, 0), 255, 255,
-            facecolor=self.COLORS['undefined'],
-            edgecolor='none'
-        ))
+        # Draw all zones as one indexed image over the undefined background
+        draw_zone_map(ax, self)
         
-        # Draw diagonal zones first (corners)
-        # North-East (high X, high Y)
-        self._draw_zone(ax, 
-                       self.DIAGONAL_THRESHOLD_HIGH, self.DIAGONAL_THRESHOLD_HIGH,
-                       255, 255,
-                       'north_east', 'NE')
-        
-        # North-West (low X, high Y)
-        self._draw_zone(ax,
-                       0, 255 - self.DIAGONAL_THRESHOLD_LOW,
-                       self.DIAGONAL_THRESHOLD_LOW, 255,
-                       'north_west', 'NW')
-        
-        # South-East (high X, low Y)
-        self._draw_zone(ax,
-                       self.DIAGONAL_THRESHOLD_HIGH, 0,
-                       255, self.DIAGONAL_THRESHOLD_LOW,
-                       'south_east', 'SE')
-        
-        # South-West (low X, low Y)
-        self._draw_zone(ax,
-                       0, 0,
-                       self.DIAGONAL_THRESHOLD_LOW, self.DIAGONAL_THRESHOLD_LOW,
-                       'south_west', 'SW')
-        
-        # Draw cardinal zones
-        # North (high Y, centered X)
-        self._draw_zone(ax,
-                       self.CENTER_X_MIN, self.THRESHOLD_NORTH_Y,
-                       self.CENTER_X_MAX, 255,
-                       'north', 'N')
-        
-        # South (low Y, centered X)
-        self._draw_zone(ax,
-                       self.CENTER_X_MIN, 0,
-                       self.CENTER_X_MAX, self.THRESHOLD_SOUTH_Y,
-                       'south', 'S')
-        
-        # East (high X, centered Y)
-        self._draw_zone(ax,
-                       self.THRESHOLD_EAST_X, self.CENTER_Y_MIN,
-                       255, self.CENTER_X_MAX,
-                       'east', 'E')
-        
-        # West (low X, centered Y)
-        self._draw_zone(ax,
-                       0, self.CENTER_Y_MIN,
-                       self.THRESHOLD_WEST_X, self.CENTER_X_MAX,
-                       'west', 'W')
-        
-        # Draw center zone (dead zone)
-        self._draw_zone(ax,
-                       self.CENTER_X_MIN, self.CENTER_Y_MIN,
-                       self.CENTER_X_MAX, self.CENTER_Y_MAX,
-                       'center', 'CENTER\n(Dead Zone)')
+        # Label each zone
+        for zone in zone_table(self):
+            self._label_zone(ax, zone['x1'], zone['y1'], zone['x2'], zone['y2'],
+                             zone['label'])
         
         # Add grid
         ax.grid(True, alpha=0.3)
@@ -158,37 +159,25 @@ class DirectionZonesVisualizer:
         # Add legend
         self._add_legend(ax)
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         output_path = None
         if save:
             output_path = self.output_dir / 'direction_zones.png'
-            plt.savefig(output_path, dpi=150, bbox_inches='tight')
+            fig.savefig(output_path, dpi=100,
+                        metadata={'Signature': self.signature()})
             print(f"Saved: {output_path}")
         
         if show:
             plt.show()
-        else:
-            plt.close()
+            plt.close(fig)
         
         return str(output_path) if output_path else None
     
-    def _draw_zone(self, ax, x1, y1, x2, y2, color_key, label):
-        """Draw a rectangular zone with label."""
-        width = x2 - x1
-        height = y2 - y1
-        
-        ax.add_patch(patches.Rectangle(
-            (x1, y1), width, height,
-            facecolor=self.COLORS[color_key],
-            edgecolor='black',
-            linewidth=1,
-            alpha=0.7
-        ))
-        
-        # Add label at center
-        cx = x1 + width / 2
-        cy = y1 + height / 2
+    def _label_zone(self, ax, x1, y1, x2, y2, label):
+        """Add a label at the center of a rectangular zone."""
+        cx = (x1 + x2) / 2
+        cy = (y1 + y2) / 2
         ax.text(cx, cy, label, ha='center', va='center',
                 fontsize=10, fontweight='bold', color='white',
                 bbox=dict(boxstyle='round', facecolor='black', alpha=0.5))
@@ -212,24 +201,9 @@ class DirectionZonesVisualizer:
     def _add_legend(self, ax):
         """Add a legend for the zones."""
         legend_elements = [
-            patches.Patch(facecolor=self.COLORS['center'], edgecolor='black',
-                         label='Center (Dead Zone)'),
-            patches.Patch(facecolor=self.COLORS['north'], edgecolor='black',
-                         label='North'),
-            patches.Patch(facecolor=self.COLORS['south'], edgecolor='black',
-                         label='South'),
-            patches.Patch(facecolor=self.COLORS['east'], edgecolor='black',
-                         label='East'),
-            patches.Patch(facecolor=self.COLORS['west'], edgecolor='black',
-                         label='West'),
-            patches.Patch(facecolor=self.COLORS['north_east'], edgecolor='black',
-                         label='North-East'),
-            patches.Patch(facecolor=self.COLORS['north_west'], edgecolor='black',
-                         label='North-West'),
-            patches.Patch(facecolor=self.COLORS['south_east'], edgecolor='black',
-                         label='South-East'),
-            patches.Patch(facecolor=self.COLORS['south_west'], edgecolor='black',
-                         label='South-West'),
+            patches.Patch(facecolor=zone['color'], edgecolor='black',
+                          label=zone['name'])
+            for zone in zone_table(self)
         ]
         ax.legend(handles=legend_elements, loc='upper left', 
                  bbox_to_anchor=(1.02, 1), fontsize=9)
@@ -247,34 +221,31 @@ class DirectionZonesVisualizer:
         Returns:
             Path to saved image (if saved)
         """
-        fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+        fig = _new_figure((14, 5), show)
+        
+        # Bind thresholds once as uint8 scalars, matching the ADC samples
+        west, east, cx_min, cx_max = np.uint8([
+            self.THRESHOLD_WEST_X, self.THRESHOLD_EAST_X,
+            self.CENTER_X_MIN, self.CENTER_X_MAX])
+        south, north, cy_min, cy_max = np.uint8([
+            self.THRESHOLD_SOUTH_Y, self.THRESHOLD_NORTH_Y,
+            self.CENTER_Y_MIN, self.CENTER_Y_MAX])
+        
+        # ADC values and one curve buffer shared by both axes
+        values = np.arange(0, 256, dtype=np.uint8)
+        zones = np.empty(values.shape, dtype=np.float32)
         
         # X-axis response curve
-        ax1 = axes[0]
-        x_values = np.arange(0, 256)
-        
-        # Define zones for X axis
-        x_zones = np.zeros_like(x_values, dtype=float)
-        for i, x in enumerate(x_values):
-            if x <= self.THRESHOLD_WEST_X:
-                x_zones[i] = -1  # West
-            elif x >= self.THRESHOLD_EAST_X:
-                x_zones[i] = 1   # East
-            elif self.CENTER_X_MIN <= x <= self.CENTER_X_MAX:
-                x_zones[i] = 0   # Center
-            else:
-                x_zones[i] = np.interp(x, 
-                                       [self.THRESHOLD_WEST_X, self.CENTER_X_MIN,
-                                        self.CENTER_X_MAX, self.THRESHOLD_EAST_X],
-                                       [-1, 0, 0, 1])
-        
-        ax1.plot(x_values, x_zones, 'b-', linewidth=2)
-        ax1.fill_between(x_values, x_zones, alpha=0.3)
+        ax1 = fig.add_subplot(1, 2, 1)
+        x_zones = self._axis_curve(values, zones, west, east, cx_min, cx_max).copy()
+        
+        ax1.plot(values, x_zones, 'b-', linewidth=2)
+        ax1.fill_between(values, x_zones, alpha=0.3)
         ax1.axhline(y=0, color='k', linestyle='-', alpha=0.3)
-        ax1.axvline(x=self.CENTER_X_MIN, color='g', linestyle='--', alpha=0.5, label='Center Zone')
-        ax1.axvline(x=self.CENTER_X_MAX, color='g', linestyle='--', alpha=0.5)
-        ax1.axvline(x=self.THRESHOLD_WEST_X, color='r', linestyle='--', alpha=0.5, label='West Threshold')
-        ax1.axvline(x=self.THRESHOLD_EAST_X, color='purple', linestyle='--', alpha=0.5, label='East Threshold')
+        ax1.axvline(x=cx_min, color='g', linestyle='--', alpha=0.5, label='Center Zone')
+        ax1.axvline(x=cx_max, color='g', linestyle='--', alpha=0.5)
+        ax1.axvline(x=west, color='r', linestyle='--', alpha=0.5, label='West Threshold')
+        ax1.axvline(x=east, color='purple', linestyle='--', alpha=0.5, label='East Threshold')
         ax1.set_xlabel('X-Axis ADC Value')
         ax1.set_ylabel('Direction (-1=West, 0=Center, 1=East)')
         ax1.set_title('X-Axis Response Curve')
@@ -284,30 +255,16 @@ class DirectionZonesVisualizer:
         ax1.set_ylim(-1.2, 1.2)
         
         # Y-axis response curve
-        ax2 = axes[1]
-        y_values = np.arange(0, 256)
-        
-        y_zones = np.zeros_like(y_values, dtype=float)
-        for i, y in enumerate(y_values):
-            if y <= self.THRESHOLD_SOUTH_Y:
-                y_zones[i] = -1  # South
-            elif y >= self.THRESHOLD_NORTH_Y:
-                y_zones[i] = 1   # North
-            elif self.CENTER_Y_MIN <= y <= self.CENTER_Y_MAX:
-                y_zones[i] = 0   # Center
-            else:
-                y_zones[i] = np.interp(y,
-                                       [self.THRESHOLD_SOUTH_Y, self.CENTER_Y_MIN,
-                                        self.CENTER_Y_MAX, self.THRESHOLD_NORTH_Y],
-                                       [-1, 0, 0, 1])
-        
-        ax2.plot(y_values, y_zones, 'orange', linewidth=2)
-        ax2.fill_between(y_values, y_zones, alpha=0.3, color='orange')
+        ax2 = fig.add_subplot(1, 2, 2)
+        y_zones = self._axis_curve(values, zones, south, north, cy_min, cy_max)
+        
+        ax2.plot(values, y_zones, 'orange', linewidth=2)
+        ax2.fill_between(values, y_zones, alpha=0.3, color='orange')
         ax2.axhline(y=0, color='k', linestyle='-', alpha=0.3)
-        ax2.axvline(x=self.CENTER_Y_MIN, color='g', linestyle='--', alpha=0.5, label='Center Zone')
-        ax2.axvline(x=self.CENTER_Y_MAX, color='g', linestyle='--', alpha=0.5)
-        ax2.axvline(x=self.THRESHOLD_SOUTH_Y, color='orange', linestyle='--', alpha=0.5, label='South Threshold')
-        ax2.axvline(x=self.THRESHOLD_NORTH_Y, color='blue', linestyle='--', alpha=0.5, label='North Threshold')
+        ax2.axvline(x=cy_min, color='g', linestyle='--', alpha=0.5, label='Center Zone')
+        ax2.axvline(x=cy_max, color='g', linestyle='--', alpha=0.5)
+        ax2.axvline(x=south, color='orange', linestyle='--', alpha=0.5, label='South Threshold')
+        ax2.axvline(x=north, color='blue', linestyle='--', alpha=0.5, label='North Threshold')
         ax2.set_xlabel('Y-Axis ADC Value')
         ax2.set_ylabel('Direction (-1=South, 0=Center, 1=North)')
         ax2.set_title('Y-Axis Response Curve')
@@ -316,22 +273,50 @@ class DirectionZonesVisualizer:
         ax2.set_xlim(0, 255)
         ax2.set_ylim(-1.2, 1.2)
         
-        plt.suptitle('Joystick Response Curves', fontsize=14, fontweight='bold')
-        plt.tight_layout()
+        fig.suptitle('Joystick Response Curves', fontsize=14, fontweight='bold')
+        fig.tight_layout()
         
         output_path = None
         if save:
             output_path = self.output_dir / 'joystick_response.png'
-            plt.savefig(output_path, dpi=150, bbox_inches='tight')
+            fig.savefig(output_path, dpi=120,
+                        metadata={'Signature': self.signature()})
             print(f"Saved: {output_path}")
         
         if show:
             plt.show()
-        else:
-            plt.close()
+            plt.close(fig)
         
         return str(output_path) if output_path else None
     
+    @staticmethod
+    def _axis_curve(values, zones, low, high, c_min, c_max):
+        """
+        Fill a response curve buffer for one axis.
+        
+        Args:
+            values: ADC values (0-255)
+            zones: float32 output buffer, same length as values
+            low: West/South threshold
+            high: East/North threshold
+            c_min: Center zone minimum
+            c_max: Center zone maximum
+            
+        Returns:
+            zones, ranging from -1 (low) through 0 (center) to 1 (high)
+        """
+        # Assigned lowest priority first so the thresholds win on shared edges
+        zones[(values >= c_min) & (values <= c_max)] = 0
+        zones[values >= high] = 1
+        zones[values <= low] = -1
+        
+        # Linear ramps between the center zone and the thresholds
+        below = (values > low) & (values < c_min)
+        above = (values > c_max) & (values < high)
+        zones[below] = np.interp(values[below], [low, c_min], [-1, 0])
+        zones[above] = np.interp(values[above], [c_max, high], [0, 1])
+        return zones
+    
     def create_hardware_diagram(self, save: bool = True, show: bool = False) -> str:
         """
         Create a hardware connection diagram.
@@ -343,9 +328,12 @@ class DirectionZonesVisualizer:
         Returns:
             Path to saved image (if saved)
         """
-        fig, ax = plt.subplots(figsize=(12, 8))
-        ax.set_xlim(0, 12)
-        ax.set_ylim(0, 8)
+        # Limits hug the drawn content (pin labels on the left, legend
+        # rows below y=0) and the figure size matches their aspect
+        fig = _new_figure((10, 6.6), show)
+        ax = fig.add_subplot(1, 1, 1)
+        ax.set_xlim(-0.5, 12)
+        ax.set_ylim(-1.4, 6.3)
         ax.set_aspect('equal')
         ax.axis('off')
         ax.set_title('Hardware Connection Diagram', fontsize=14, fontweight='bold')
@@ -447,18 +435,18 @@ class DirectionZonesVisualizer:
             ax.plot([0.5, 1.2], [y_pos, y_pos], color=color, linewidth=2)
             ax.text(1.4, y_pos, label, fontsize=8, va='center')
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         output_path = None
         if save:
             output_path = self.output_dir / 'hardware_diagram.png'
-            plt.savefig(output_path, dpi=150, bbox_inches='tight', facecolor='white')
+            fig.savefig(output_path, dpi=100, facecolor='white',
+                        metadata={'Signature': self.signature()})
             print(f"Saved: {output_path}")
         
         if show:
             plt.show()
-        else:
-            plt.close()
+            plt.close(fig)
         
         return str(output_path) if output_path else None
     
@@ -473,20 +461,33 @@ class DirectionZonesVisualizer:
 
 
 def main():
-    """Generate all visualization images."""
+    """Generate all visualization images (skipping up-to-date ones)."""
     print("Generating joystick visualizations...")
     
     visualizer = DirectionZonesVisualizer()
+    force = '--force' in sys.argv[1:]
     
     # Generate all diagrams
-    zone_path = visualizer.create_zone_diagram(save=True, show=False)
-    response_path = visualizer.create_response_curve(save=True, show=False)
-    hardware_path = visualizer.create_hardware_diagram(save=True, show=False)
+    diagrams = [
+        ('direction_zones.png', visualizer.create_zone_diagram),
+        ('joystick_response.png', visualizer.create_response_curve),
+        ('hardware_diagram.png', visualizer.create_hardware_diagram),
+    ]
+    paths = []
+    skipped = 0
+    for filename, create in diagrams:
+        if not force and visualizer.is_current(filename):
+            print(f"Up to date: {visualizer.output_dir / filename}")
+            paths.append(str(visualizer.output_dir / filename))
+            skipped += 1
+        else:
+            paths.append(create(save=True, show=False))
     
-    print("\nAll visualizations generated successfully!")
+    print(f"\nRegenerated {len(diagrams) - skipped} visualization(s), "
+          f"skipped {skipped} up to date")
     print(f"Output directory: {visualizer.output_dir}")
     
-    return [zone_path, response_path, hardware_path]
+    return paths
 
 
 if __name__ == '__main__':
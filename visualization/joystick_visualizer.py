@@ -5,12 +5,150 @@ Provides an interactive visualization of joystick position and direction
 detection. Useful for understanding the detection algorithm.
 """
 
+import operator
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PatchCollection
+from matplotlib.colors import ListedColormap, to_rgba
+from matplotlib.figure import Figure
 from matplotlib.widgets import Slider
 import numpy as np
 from pathlib import Path
 
+try:
+    from joystick_visualizer_numba import _direction_id_vec
+except ImportError:  # numba not installed
+    _direction_id_vec = None
+
+
+# Zone map index and color for positions that no direction zone covers
+UNDEFINED_ZONE = 9
+UNDEFINED_COLOR = to_rgba('#E0E0E0')
+
+# Direction zone metadata in direction enum order, one field per column;
+# zone_table() fills in the rectangle for a given configuration
+_ZONE_DTYPE = np.dtype([
+    ('x1', np.int16), ('y1', np.int16), ('x2', np.int16), ('y2', np.int16),
+    ('key', 'U10'), ('label', 'U20'), ('name', 'U20'), ('color', np.float64, 4),
+])
+_ZONE_TABLE = np.array([
+    (0, 0, 0, 0, 'center', 'CENTER\n(Dead Zone)', 'Center (Dead Zone)', to_rgba('#4CAF50')),
+    (0, 0, 0, 0, 'north', 'N', 'North', to_rgba('#2196F3')),
+    (0, 0, 0, 0, 'south', 'S', 'South', to_rgba('#FF9800')),
+    (0, 0, 0, 0, 'east', 'E', 'East', to_rgba('#9C27B0')),
+    (0, 0, 0, 0, 'west', 'W', 'West', to_rgba('#F44336')),
+    (0, 0, 0, 0, 'north_east', 'NE', 'North-East', to_rgba('#00BCD4')),
+    (0, 0, 0, 0, 'north_west', 'NW', 'North-West', to_rgba('#3F51B5')),
+    (0, 0, 0, 0, 'south_east', 'SE', 'South-East', to_rgba('#FFEB3B')),
+    (0, 0, 0, 0, 'south_west', 'SW', 'South-West', to_rgba('#795548')),
+], dtype=_ZONE_DTYPE)
+
+
+def build_direction_lut(cfg, fallback: int = 0) -> np.ndarray:
+    """
+    Build a direction index table for every X/Y value.
+    
+    Applies the joystick.c direction checks as broadcast masks, in the
+    same priority order. Indices follow the C direction enum (CENTER,
+    NORTH, SOUTH, EAST, WEST, NORTH_EAST, NORTH_WEST, SOUTH_EAST,
+    SOUTH_WEST).
+    
+    Args:
+        cfg: Object with the config.h threshold attributes
+        fallback: Index for positions no zone covers (0 = CENTER, as in C)
+        
+    Returns:
+        256x256 uint8 array indexed [y, x]
+    """
+    xs = np.arange(256)
+    ys = np.arange(256)[:, None]
+    
+    x_center = (xs >= cfg.CENTER_X_MIN) & (xs <= cfg.CENTER_X_MAX)
+    y_band = (ys >= cfg.CENTER_Y_MIN) & (ys <= cfg.CENTER_Y_MAX)
+    
+    conditions = [
+        x_center & (ys >= cfg.CENTER_Y_MIN) & (ys <= cfg.CENTER_Y_MAX),
+        (xs > cfg.DIAGONAL_THRESHOLD_HIGH) & (ys > cfg.DIAGONAL_THRESHOLD_HIGH),
+        (xs < cfg.DIAGONAL_THRESHOLD_LOW) & (ys > 255 - cfg.DIAGONAL_THRESHOLD_LOW),
+        (xs > cfg.DIAGONAL_THRESHOLD_HIGH) & (ys < cfg.DIAGONAL_THRESHOLD_LOW),
+        (xs < cfg.DIAGONAL_THRESHOLD_LOW) & (ys < cfg.DIAGONAL_THRESHOLD_LOW),
+        (ys >= cfg.THRESHOLD_NORTH_Y) & x_center,
+        (ys <= cfg.THRESHOLD_SOUTH_Y) & x_center,
+        (xs >= cfg.THRESHOLD_EAST_X) & y_band,
+        (xs <= cfg.THRESHOLD_WEST_X) & y_band,
+    ]
+    # CENTER, NORTH_EAST, NORTH_WEST, SOUTH_EAST, SOUTH_WEST, N, S, E, W
+    choices = [0, 5, 6, 7, 8, 1, 2, 3, 4]
+    return np.select(conditions, choices, default=fallback).astype(np.uint8)
+
+
+def zone_table(cfg, lut: np.ndarray = None) -> np.ndarray:
+    """
+    Get the direction zone table for a configuration.
+    
+    Zone rectangles are the bounds of the lookup table cells each zone
+    actually covers, so they agree with the drawn zone map.
+    
+    Args:
+        cfg: Object with the config.h threshold attributes
+        lut: Table from build_direction_lut(cfg, fallback=UNDEFINED_ZONE),
+            built if not given
+        
+    Returns:
+        Structured array in direction enum order with fields x1, y1, x2,
+        y2 (inclusive cell bounds), key, label, name and color (RGBA).
+        Zones that cover no cells are left out.
+    """
+    if lut is None:
+        lut = build_direction_lut(cfg, fallback=UNDEFINED_ZONE)
+    
+    table = _ZONE_TABLE.copy()
+    present = np.zeros(len(table), dtype=bool)
+    for index in range(len(table)):
+        cells = lut == index
+        xs = np.flatnonzero(cells.any(axis=0))
+        ys = np.flatnonzero(cells.any(axis=1))
+        if xs.size:
+            present[index] = True
+            bounds = (xs[0], ys[0], xs[-1], ys[-1])
+            for field, value in zip(('x1', 'y1', 'x2', 'y2'), bounds):
+                table[field][index] = value
+    return table[present]
+
+
+def draw_zone_map(ax, cfg, alpha: float = 0.7):
+    """
+    Draw every direction zone as a single indexed image.
+    
+    Positions no zone covers are left transparent over the axes
+    background. Zone outlines are added on top as one PatchCollection,
+    on the same cell edges as the image.
+    
+    Args:
+        ax: Axes to draw on
+        cfg: Object with the config.h threshold attributes
+        alpha: Zone opacity
+    """
+    lut = build_direction_lut(cfg, fallback=UNDEFINED_ZONE)
+    ax.set_facecolor(UNDEFINED_COLOR)
+    
+    # Fills stay a bitmap in vector exports too; outlines stay vector.
+    # Cell i spans i - 0.5 to i + 0.5 in both the image and the outlines.
+    ax.imshow(np.ma.masked_equal(lut, UNDEFINED_ZONE),
+              cmap=ListedColormap(_ZONE_TABLE['color']), vmin=0, vmax=UNDEFINED_ZONE - 1,
+              origin='lower', extent=(-0.5, 255.5, -0.5, 255.5),
+              interpolation='nearest', alpha=alpha, rasterized=True)
+    
+    outlines = [patches.Rectangle((z['x1'] - 0.5, z['y1'] - 0.5),
+                                  z['x2'] - z['x1'] + 1, z['y2'] - z['y1'] + 1)
+                for z in zone_table(cfg, lut)]
+    ax.add_collection(PatchCollection(outlines, facecolors='none',
+                                      edgecolors='black', linewidths=1))
+
 
 class JoystickVisualizer:
     """
@@ -42,19 +180,104 @@ class JoystickVisualizer:
         'NORTH_EAST', 'NORTH_WEST', 'SOUTH_EAST', 'SOUTH_WEST'
     ]
     
+    # Direction index lookup table [y, x], built on first use
+    _dir_lut = None
+    
     def __init__(self):
         """Initialize the visualizer."""
+        cls = type(self)
+        if cls.__dict__.get('_dir_lut') is None:
+            cls._dir_lut = cls._build_lut()
+        
         self.fig = None
         self.ax = None
         self.position_marker = None
         self.direction_text = None
         self.x_slider = None
         self.y_slider = None
+        self._zone_background = None
+    
+    @classmethod
+    def _build_lut(cls) -> np.ndarray:
+        """
+        Build the direction lookup table for every X/Y value.
+        
+        Returns:
+            256x256 uint8 array of DIRECTIONS indices, indexed [y, x]
+        """
+        return build_direction_lut(cls)
+    
+    @classmethod
+    def _threshold_params(cls) -> tuple:
+        """Get the thresholds in the order the Numba kernels expect."""
+        return (cls.THRESHOLD_NORTH_Y, cls.THRESHOLD_SOUTH_Y,
+                cls.THRESHOLD_EAST_X, cls.THRESHOLD_WEST_X,
+                cls.CENTER_X_MIN, cls.CENTER_X_MAX,
+                cls.CENTER_Y_MIN, cls.CENTER_Y_MAX,
+                cls.DIAGONAL_THRESHOLD_HIGH, cls.DIAGONAL_THRESHOLD_LOW)
     
     def get_direction(self, x: int, y: int) -> str:
         """
         Determine direction from X/Y values.
         
+        Args:
+            x: X-axis value (0-255)
+            y: Y-axis value (0-255)
+            
+        Returns:
+            Direction name string
+            
+        Raises:
+            ValueError: If x or y is outside 0-255
+        """
+        x = operator.index(x)
+        y = operator.index(y)
+        # Negative values would wrap around the lookup table
+        if (x | y) >> 8:
+            raise ValueError(f"ADC values must be 0-255, got ({x}, {y})")
+        return self.DIRECTIONS[self._dir_lut[y, x]]
+    
+    def get_directions_vec(self, xs, ys) -> np.ndarray:
+        """
+        Determine directions for arrays of X/Y values.
+        
+        Uses the parallel Numba kernel when numba is installed, otherwise
+        indexes the lookup table.
+        
+        Args:
+            xs: Array of X-axis values (0-255)
+            ys: Array of Y-axis values (0-255), same shape as xs
+            
+        Returns:
+            uint8 array of DIRECTIONS indices
+            
+        Raises:
+            ValueError: If xs and ys differ in shape or hold values
+                outside 0-255
+        """
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        # Validate once so both backends reject the same input
+        if xs.shape != ys.shape:
+            raise ValueError(f"xs and ys must have the same shape, "
+                             f"got {xs.shape} and {ys.shape}")
+        for values in (xs, ys):
+            if ((values < 0) | (values > 255)).any():
+                raise ValueError("ADC values must be 0-255")
+        xs = np.ascontiguousarray(xs, dtype=np.intp)
+        ys = np.ascontiguousarray(ys, dtype=np.intp)
+        
+        if _direction_id_vec is not None:
+            out = np.empty(xs.shape, dtype=np.uint8)
+            _direction_id_vec(xs.ravel(), ys.ravel(), out.ravel(),
+                              self._threshold_params())
+            return out
+        return self._dir_lut[ys, xs]
+    
+    def _classify(self, x: int, y: int) -> str:
+        """
+        Reference direction detection matching joystick.c.
+        
         Args:
             x: X-axis value (0-255)
             y: Y-axis value (0-255)
@@ -82,71 +305,39 @@ class JoystickVisualizer:
             return 'NORTH'
         if y <= self.THRESHOLD_SOUTH_Y and self.CENTER_X_MIN <= x <= self.CENTER_X_MAX:
             return 'SOUTH'
-        if x >= self.THRESHOLD_EAST_X and self.CENTER_Y_MIN <= y <= self.CENTER_X_MAX:
+        if x >= self.THRESHOLD_EAST_X and self.CENTER_Y_MIN <= y <= self.CENTER_Y_MAX:
             return 'EAST'
-        if x <= self.THRESHOLD_WEST_X and self.CENTER_Y_MIN <= y <= self.CENTER_X_MAX:
+        if x <= self.THRESHOLD_WEST_X and self.CENTER_Y_MIN <= y <= self.CENTER_Y_MAX:
             return 'WEST'
         
         return 'CENTER'
     
     def _draw_zones(self, ax):
         """Draw the direction zones on the axes."""
-        # Colors
-        colors = {
-            'center': '#4CAF50',
-            'north': '#2196F3',
-            'south': '#FF9800',
-            'east': '#9C27B0',
-            'west': '#F44336',
-            'ne': '#00BCD4',
-            'nw': '#3F51B5',
-            'se': '#FFEB3B',
-            'sw': '#795548',
-        }
-        
-        # Background
-        ax.add_patch(patches.Rectangle((0, 0), 255, 255, facecolor='#E0E0E0'))
-        
-        # Diagonal zones
-        ax.add_patch(patches.Rectangle(
-            (self.DIAGONAL_THRESHOLD_HIGH, self.DIAGONAL_THRESHOLD_HIGH),
-            255 - self.DIAGONAL_THRESHOLD_HIGH, 255 - self.DIAGONAL_THRESHOLD_HIGH,
-            facecolor=colors['ne'], alpha=0.6))
-        ax.add_patch(patches.Rectangle(
-            (0, 255 - self.DIAGONAL_THRESHOLD_LOW),
-            self.DIAGONAL_THRESHOLD_LOW, self.DIAGONAL_THRESHOLD_LOW,
-            facecolor=colors['nw'], alpha=0.6))
-        ax.add_patch(patches.Rectangle(
-            (self.DIAGONAL_THRESHOLD_HIGH, 0),
-            255 - self.DIAGONAL_THRESHOLD_HIGH, self.DIAGONAL_THRESHOLD_LOW,
-            facecolor=colors['se'], alpha=0.6))
-        ax.add_patch(patches.Rectangle(
-            (0, 0), self.DIAGONAL_THRESHOLD_LOW, self.DIAGONAL_THRESHOLD_LOW,
-            facecolor=colors['sw'], alpha=0.6))
-        
-        # Cardinal zones
-        ax.add_patch(patches.Rectangle(
-            (self.CENTER_X_MIN, self.THRESHOLD_NORTH_Y),
-            self.CENTER_X_MAX - self.CENTER_X_MIN, 255 - self.THRESHOLD_NORTH_Y,
-            facecolor=colors['north'], alpha=0.6))
-        ax.add_patch(patches.Rectangle(
-            (self.CENTER_X_MIN, 0),
-            self.CENTER_X_MAX - self.CENTER_X_MIN, self.THRESHOLD_SOUTH_Y,
-            facecolor=colors['south'], alpha=0.6))
-        ax.add_patch(patches.Rectangle(
-            (self.THRESHOLD_EAST_X, self.CENTER_Y_MIN),
-            255 - self.THRESHOLD_EAST_X, self.CENTER_X_MAX - self.CENTER_Y_MIN,
-            facecolor=colors['east'], alpha=0.6))
-        ax.add_patch(patches.Rectangle(
-            (0, self.CENTER_Y_MIN),
-            self.THRESHOLD_WEST_X, self.CENTER_X_MAX - self.CENTER_Y_MIN,
-            facecolor=colors['west'], alpha=0.6))
-        
-        # Center zone
-        ax.add_patch(patches.Rectangle(
-            (self.CENTER_X_MIN, self.CENTER_Y_MIN),
-            self.CENTER_X_MAX - self.CENTER_X_MIN, self.CENTER_Y_MAX - self.CENTER_Y_MIN,
-            facecolor=colors['center'], alpha=0.8))
+        draw_zone_map(ax, self)
+    
+    def _render_zone_background(self) -> np.ndarray:
+        """
+        Render the direction zones once to an RGBA image.
+        
+        The image covers the 0-255 ADC square exactly and is cached so
+        repeated frames can show it with a single imshow.
+        
+        Returns:
+            RGBA pixel array (rows top to bottom)
+        """
+        if self._zone_background is None:
+            # The axes are hidden, so the figure supplies the background
+            fig = Figure(figsize=(6, 6), dpi=100, facecolor=UNDEFINED_COLOR)
+            FigureCanvasAgg(fig)
+            ax = fig.add_axes([0, 0, 1, 1])
+            ax.set_xlim(0, 255)
+            ax.set_ylim(0, 255)
+            ax.axis('off')
+            self._draw_zones(ax)
+            fig.canvas.draw()
+            self._zone_background = np.asarray(fig.canvas.buffer_rgba()).copy()
+        return self._zone_background
     
     def create_interactive(self):
         """Create an interactive matplotlib visualization with sliders."""
@@ -180,6 +371,25 @@ class JoystickVisualizer:
         self.x_slider = Slider(ax_x, 'X', 0, 255, valinit=128, valstep=1)
         self.y_slider = Slider(ax_y, 'Y', 0, 255, valinit=128, valstep=1)
         
+        # Sliders redraw through update() below rather than draw_idle()
+        self.x_slider.drawon = False
+        self.y_slider.drawon = False
+        
+        # Artists that change on slider motion are animated (left out of
+        # full draws) and blitted over a background cached on each draw
+        canvas = self.fig.canvas
+        animated = [self.position_marker, self.direction_text,
+                    self.x_slider.valtext, self.y_slider.valtext]
+        for artist in animated:
+            artist.set_animated(True)
+        background = None
+        
+        def on_draw(event):
+            nonlocal background
+            background = canvas.copy_from_bbox(self.fig.bbox)
+            for artist in animated:
+                self.fig.draw_artist(artist)
+        
         def update(val):
             x = int(self.x_slider.val)
             y = int(self.y_slider.val)
@@ -187,8 +397,16 @@ class JoystickVisualizer:
             self.position_marker.set_data([x], [y])
             direction = self.get_direction(x, y)
             self.direction_text.set_text(f'Direction: {direction}\n(X={x}, Y={y})')
-            self.fig.canvas.draw_idle()
+            
+            if background is None:
+                canvas.draw_idle()
+                return
+            canvas.restore_region(background)
+            for artist in [ax_x, ax_y] + animated:
+                self.fig.draw_artist(artist)
+            canvas.blit(self.fig.bbox)
         
+        canvas.mpl_connect('draw_event', on_draw)
         self.x_slider.on_changed(update)
         self.y_slider.on_changed(update)
         
@@ -212,8 +430,6 @@ class JoystickVisualizer:
             output_path = Path(__file__).parent.parent / 'docs' / 'images'
         output_path.mkdir(parents=True, exist_ok=True)
         
-        fig, ax = plt.subplots(figsize=(8, 8))
-        
         # Positions for a full rotation demo
         positions = [
             (128, 128, 'CENTER'),
@@ -230,33 +446,70 @@ class JoystickVisualizer:
         
         print("Generating movement simulation...")
         
-        for i, (x, y, expected_dir) in enumerate(positions):
-            ax.clear()
-            ax.set_xlim(0, 255)
-            ax.set_ylim(0, 255)
-            ax.set_aspect('equal')
-            ax.set_xlabel('X Axis')
-            ax.set_ylabel('Y Axis')
-            ax.set_title(f'Joystick Position: {expected_dir}', fontsize=14, fontweight='bold')
-            
-            self._draw_zones(ax)
-            
-            ax.plot(x, y, 'ko', markersize=20)
-            ax.plot(x, y, 'wo', markersize=10)
-            
-            ax.text(128, 270, f'X={x}, Y={y}', fontsize=12, ha='center',
-                   bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
-            
-            ax.grid(True, alpha=0.3)
-            
-            filename = output_path / f'simulation_frame_{i:02d}.png'
-            plt.savefig(filename, dpi=100, bbox_inches='tight')
-            print(f"  Saved: {filename}")
+        # Frames are independent, so they are rendered in parallel
+        background = self._render_zone_background()
+        count = len(positions)
+        args = (range(count), *zip(*positions),
+                [output_path] * count, [background] * count)
+        workers = min(count, os.cpu_count() or 1)
+        
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for filename in pool.map(_render_frame, *args):
+                    print(f"  Saved: {filename}")
+        else:
+            for filename in map(_render_frame, *args):
+                print(f"  Saved: {filename}")
         
-        plt.close()
         print(f"Simulation frames saved to: {output_path}")
 
 
+def _render_frame(i: int, x: int, y: int, expected_dir: str,
+                  output_path: Path, background: np.ndarray) -> Path:
+    """
+    Render one movement simulation frame to a PNG file.
+    
+    Runs in a worker process, so it builds its own Agg figure.
+    
+    Args:
+        i: Frame index (used in the file name)
+        x: X-axis value (0-255)
+        y: Y-axis value (0-255)
+        expected_dir: Direction name shown in the title
+        output_path: Directory to save the frame in
+        background: Pre-rendered zone image from _render_zone_background
+        
+    Returns:
+        Path of the saved frame
+    """
+    # Figure is rendered directly with Agg, bypassing pyplot
+    fig = Figure(figsize=(8, 8), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    # Leave room above the axes for the position label and title
+    fig.subplots_adjust(left=0.08, right=0.97, bottom=0.07, top=0.88)
+    
+    ax.set_xlim(0, 255)
+    ax.set_ylim(0, 255)
+    ax.set_aspect('equal')
+    ax.set_xlabel('X Axis')
+    ax.set_ylabel('Y Axis')
+    ax.set_title(f'Joystick Position: {expected_dir}', fontsize=14, fontweight='bold')
+    ax.imshow(background, extent=(0, 255, 0, 255), interpolation='nearest', zorder=0)
+    
+    ax.plot(x, y, 'ko', markersize=20)
+    ax.plot(x, y, 'wo', markersize=10)
+    
+    ax.text(128, 270, f'X={x}, Y={y}', fontsize=12, ha='center',
+            bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+    
+    ax.grid(True, alpha=0.3)
+    
+    filename = output_path / f'simulation_frame_{i:02d}.png'
+    canvas.print_png(str(filename))
+    return filename
+
+
 def main():
     """Run the interactive visualizer or generate simulation."""
     import sys
@@ -0,0 +1,66 @@
+"""
+Joystick Visualizer Numba Kernels - compiled direction classification.
+
+This module provides the optional Numba-accelerated backend for
+JoystickVisualizer.get_directions_vec. It requires numba;
+joystick_visualizer falls back to its lookup table when the import fails.
+"""
+
+from numba import njit, prange
+
+
+@njit(cache=True, boundscheck=False)
+def _direction_id(x, y, params):
+    """
+    Determine the DIRECTIONS index for a single X/Y value.
+    
+    Args:
+        x: X-axis value (0-255)
+        y: Y-axis value (0-255)
+        params: Thresholds in JoystickVisualizer._threshold_params order
+    
+    Returns:
+        DIRECTIONS index (0-8)
+    """
+    nY, sY, eX, wX, cxmn, cxmx, cymn, cymx, dhi, dlo = params
+    
+    # Check center zone
+    if cxmn <= x <= cxmx and cymn <= y <= cymx:
+        return 0  # CENTER
+    
+    # Check diagonals
+    if x > dhi and y > dhi:
+        return 5  # NORTH_EAST
+    if x < dlo and y > (255 - dlo):
+        return 6  # NORTH_WEST
+    if x > dhi and y < dlo:
+        return 7  # SOUTH_EAST
+    if x < dlo and y < dlo:
+        return 8  # SOUTH_WEST
+    
+    # Check cardinals
+    if y >= nY and cxmn <= x <= cxmx:
+        return 1  # NORTH
+    if y <= sY and cxmn <= x <= cxmx:
+        return 2  # SOUTH
+    if x >= eX and cymn <= y <= cymx:
+        return 3  # EAST
+    if x <= wX and cymn <= y <= cymx:
+        return 4  # WEST
+    
+    return 0  # CENTER
+
+
+@njit(parallel=True, cache=True, boundscheck=False)
+def _direction_id_vec(xs, ys, out, params):
+    """
+    Determine DIRECTIONS indices for arrays of X/Y values.
+    
+    Args:
+        xs: 1-D array of X-axis values
+        ys: 1-D array of Y-axis values, same length as xs
+        out: 1-D uint8 output array, same length as xs
+        params: Thresholds in JoystickVisualizer._threshold_params order
+    """
+    for i in prange(xs.shape[0]):
+        out[i] = _direction_id(xs[i], ys[i], params)